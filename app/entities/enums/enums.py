@@ -1,5 +1,6 @@
 from datetime import datetime
 from enum import Enum
+from types import MappingProxyType
 from typing import Optional
 from pydantic import BaseModel, Field, validator
 
@@ -11,6 +12,14 @@ class PrioridadEnum(str, Enum):
     BAJA = "baja"
 
 
+# Valor numérico de cada prioridad para ordenamiento (de menor a mayor)
+RANGO_PRIORIDAD = MappingProxyType({
+    PrioridadEnum.BAJA: 1,
+    PrioridadEnum.MEDIA: 2,
+    PrioridadEnum.ALTA: 3
+})
+
+
 class EstadoEnum(str, Enum):
     """Enumeración para los posibles estados de una tarea."""
     PENDIENTE = "pendiente"
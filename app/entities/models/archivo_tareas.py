@@ -0,0 +1,15 @@
+from typing import List
+from pydantic import BaseModel
+
+from entities.models.tarea import Tarea
+
+class ArchivoTareas(BaseModel):
+    """
+    Modelo del snapshot de tareas persistido en disco.
+    
+    Atributos:
+        siguiente_id: Identificador que se asignará a la próxima tarea
+        tareas: Lista de tareas almacenadas
+    """
+    siguiente_id: int = 1
+    tareas: List[Tarea] = []
\ No newline at end of file
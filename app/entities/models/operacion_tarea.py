@@ -0,0 +1,34 @@
+from typing import Annotated, Literal, Union
+from pydantic import BaseModel, Field
+
+from entities.models.tarea import Tarea
+from entities.enums.enums import EstadoEnum
+
+class OperacionAgregar(BaseModel):
+    """
+    Registro de una tarea agregada en el log de operaciones.
+    
+    Atributos:
+        op: Tipo de operación ("add")
+        tarea: Tarea agregada
+    """
+    op: Literal["add"]
+    tarea: Tarea
+
+
+class OperacionActualizar(BaseModel):
+    """
+    Registro de un cambio de estado en el log de operaciones.
+    
+    Atributos:
+        op: Tipo de operación ("update")
+        id: Identificador de la tarea actualizada
+        estado: Nuevo estado de la tarea
+    """
+    op: Literal["update"]
+    id: int
+    estado: EstadoEnum
+
+
+# Línea del log de operaciones, distinguida por el campo "op"
+OperacionTarea = Annotated[Union[OperacionAgregar, OperacionActualizar], Field(discriminator="op")]
\ No newline at end of file
@@ -1,7 +1,7 @@
 from datetime import datetime
 from enum import Enum
 from typing import Optional
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from entities.enums.enums import PrioridadEnum, EstadoEnum
 
@@ -17,6 +17,19 @@ class Tarea(BaseModel):
         estado: Estado actual de la tarea (pendiente, en progreso, completada)
         fecha_vencimiento: Fecha límite para completar la tarea
     """
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "id": 1,
+                "titulo": "Completar informe trimestral",
+                "descripcion": "Finalizar el informe financiero del Q3",
+                "prioridad": "alta",
+                "estado": "pendiente",
+                "fecha_vencimiento": "2025-05-15T23:59:59"
+            }
+        }
+    )
+    
     id: int
     titulo: str = Field(..., max_length=70)
     descripcion: str
@@ -29,24 +42,4 @@ class Tarea(BaseModel):
         """Valida que el título no esté vacío."""
         if not v.strip():
             raise ValueError("El título no puede estar vacío")
-        return v
-    
-    @field_validator('fecha_vencimiento')
-    def fecha_valida(cls, v):
-        """Valida que la fecha de vencimiento sea válida."""
-        if v < datetime.now():
-            raise ValueError("La fecha de vencimiento no puede ser en el pasado")
-        return v
-    
-    class Config:
-        """Configuración del modelo."""
-        schema_extra = {
-            "example": {
-                "id": 1,
-                "titulo": "Completar informe trimestral",
-                "descripcion": "Finalizar el informe financiero del Q3",
-                "prioridad": "alta",
-                "estado": "pendiente",
-                "fecha_vencimiento": "2025-05-15T23:59:59"
-            }
-        }
\ No newline at end of file
+        return v
\ No newline at end of file
@@ -2,29 +2,127 @@
 Módulo de utilidades para el sistema de gestión de tareas.
 Contiene funciones para manejar logs y medición de tiempo.
 """
-import time
+import atexit
 import os
-from datetime import datetime
+import threading
+import time
 
 
 class LogManager:
     """
     Gestor de logs para el sistema.
     Permite registrar acciones, errores y advertencias en archivos diferentes.
+    
+    Las entradas se acumulan en memoria y se escriben en disco en bloque,
+    ya sea al superar FLUSH_THRESHOLD bytes o cada FLUSH_INTERVAL segundos.
     """
+    # Tamaño máximo (en caracteres) acumulado antes de forzar la escritura
+    FLUSH_THRESHOLD = 64 * 1024
+    # Intervalo en segundos entre escrituras periódicas
+    FLUSH_INTERVAL = 1.0
+    # Rutas absolutas de directorios de logs ya verificados en este proceso
+    _ready_dirs = set()
     
     def __init__(self):
-        """Inicializa las rutas de los archivos de log."""
+        """Inicializa las rutas de los archivos de log y abre los archivos."""
         self.log_dir = "logs"
         self.ensure_log_directory_exists()
         self.action_log_path = os.path.join(self.log_dir, "acciones.log")
         self.error_log_path = os.path.join(self.log_dir, "errores.log")
         self.data_log_path = os.path.join(self.log_dir, "datos.log")
+        
+        # Archivos abiertos una sola vez durante la vida del gestor
+        self._action_file = open(self.action_log_path, "a", buffering=65536, encoding="utf-8")
+        self._error_file = open(self.error_log_path, "a", buffering=65536, encoding="utf-8")
+        self._data_file = open(self.data_log_path, "a", buffering=65536, encoding="utf-8")
+        
+        # Buffers en memoria pendientes de escribir
+        self._action_buf = []
+        self._error_buf = []
+        self._data_buf = []
+        self._buffered_size = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        
+        # Último segundo formateado y su representación (segundo, texto)
+        self._timestamp_cache = (None, "")
+        
+        # Hilo en segundo plano que vacía los buffers periódicamente
+        self._stop_event = threading.Event()
+        self._flush_thread = threading.Thread(target=self._flush_periodically, daemon=True)
+        self._flush_thread.start()
+        atexit.register(self.close)
     
     def ensure_log_directory_exists(self):
-        """Asegura que el directorio de logs exista."""
-        if not os.path.exists(self.log_dir):
-            os.makedirs(self.log_dir)
+        """Asegura que el directorio de logs exista (una sola vez por directorio)."""
+        ruta = os.path.abspath(self.log_dir)
+        if ruta not in LogManager._ready_dirs:
+            os.makedirs(ruta, exist_ok=True)
+            LogManager._ready_dirs.add(ruta)
+    
+    def _timestamp(self):
+        """
+        Devuelve la marca de tiempo actual formateada.
+        
+        El formateo se realiza una sola vez por segundo y se reutiliza
+        para todas las entradas registradas dentro del mismo segundo.
+        """
+        segundo = int(time.time())
+        segundo_cache, texto = self._timestamp_cache
+        if segundo != segundo_cache:
+            texto = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(segundo))
+            self._timestamp_cache = (segundo, texto)
+        return texto
+    
+    def _append(self, buffer, log_entry):
+        """
+        Agrega una entrada al buffer indicado y lo vacía si supera el umbral.
+        
+        Args:
+            buffer: Lista en memoria del archivo de log correspondiente
+            log_entry: Línea de log a registrar
+        """
+        with self._lock:
+            buffer.append(log_entry)
+            self._buffered_size += len(log_entry)
+            if self._buffered_size >= self.FLUSH_THRESHOLD:
+                self._flush_locked()
+    
+    def _flush_locked(self):
+        """Escribe los buffers pendientes en disco. Requiere tener el lock."""
+        if self._closed:
+            return
+        for buffer, file in ((self._action_buf, self._action_file),
+                             (self._error_buf, self._error_file),
+                             (self._data_buf, self._data_file)):
+            if buffer:
+                file.write("".join(buffer))
+                buffer.clear()
+                file.flush()
+        self._buffered_size = 0
+    
+    def _flush_all(self):
+        """Escribe en disco todas las entradas pendientes."""
+        with self._lock:
+            self._flush_locked()
+    
+    def _flush_periodically(self):
+        """Vacía los buffers cada FLUSH_INTERVAL segundos hasta que se cierre el gestor."""
+        while not self._stop_event.wait(self.FLUSH_INTERVAL):
+            self._flush_all()
+    
+    def close(self):
+        """Escribe las entradas pendientes y cierra los archivos de log."""
+        self._stop_event.set()
+        with self._lock:
+            if self._closed:
+                return
+            self._flush_locked()
+            self._closed = True
+            self._action_file.close()
+            self._error_file.close()
+            self._data_file.close()
+        atexit.unregister(self.close)
     
     def log_action(self, action, duration_ms):
         """
@@ -34,11 +132,9 @@ class LogManager:
             action: Descripción de la acción
             duration_ms: Duración en milisegundos
         """
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = self._timestamp()
         log_entry = f"{timestamp} - Acción: {action} - Duración: {duration_ms:.2f} ms\n"
-        
-        with open(self.action_log_path, "a", encoding="utf-8") as file:
-            file.write(log_entry)
+        self._append(self._action_buf, log_entry)
     
     def log_error(self, error_message):
         """
@@ -47,11 +143,9 @@ class LogManager:
         Args:
             error_message: Mensaje descriptivo del error
         """
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = self._timestamp()
         log_entry = f"{timestamp} - ERROR: {error_message}\n"
-        
-        with open(self.error_log_path, "a", encoding="utf-8") as file:
-            file.write(log_entry)
+        self._append(self._error_buf, log_entry)
     
     def log_data_operation(self, operation, data_info):
         """
@@ -61,11 +155,9 @@ class LogManager:
             operation: Tipo de operación realizada
             data_info: Información sobre los datos afectados
         """
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = self._timestamp()
         log_entry = f"{timestamp} - {operation}: {data_info}\n"
-        
-        with open(self.data_log_path, "a", encoding="utf-8") as file:
-            file.write(log_entry)
+        self._append(self._data_buf, log_entry)
 
 
 class Timer:
@@ -84,11 +176,11 @@ class Timer:
         """
         self.action = action
         self.log_manager = log_manager
-        self.start_time = None
+        self.start_ns = None
     
     def __enter__(self):
         """Inicia el cronómetro al entrar en el contexto."""
-        self.start_time = time.time()
+        self.start_ns = time.perf_counter_ns()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -100,8 +192,8 @@ class Timer:
             exc_val: Valor de la excepción, si ocurrió alguna
             exc_tb: Traceback de la excepción, si ocurrió alguna
         """
-        duration_ms = (time.time() - self.start_time) * 1000
+        duration_ms = (time.perf_counter_ns() - self.start_ns) / 1_000_000
         self.log_manager.log_action(self.action, duration_ms)
         # Si el tiempo es mayor a un segundo, mostrar advertencia
-        if duration_ms > 1000:
+        if duration_ms > 1000.0:
             print(f"¡Advertencia! La acción '{self.action}' tomó más de 1 segundo ({duration_ms:.2f} ms)")
\ No newline at end of file
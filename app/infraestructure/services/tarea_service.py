@@ -2,14 +2,19 @@
 Módulo de servicios para el sistema de gestión de tareas.
 Contiene la lógica de negocio para manipular las tareas.
 """
+from array import array
+from bisect import bisect_left, insort
 from datetime import datetime
-from typing import List, Optional, Dict
-import json
+from functools import lru_cache
+from typing import List, Optional, Dict, Tuple
 import os
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
+from pydantic_core import from_json, to_json
 
 from entities.models.tarea import Tarea
-from entities.enums.enums import PrioridadEnum, EstadoEnum
+from entities.models.archivo_tareas import ArchivoTareas
+from entities.models.operacion_tarea import OperacionAgregar, OperacionTarea
+from entities.enums.enums import PrioridadEnum, EstadoEnum, RANGO_PRIORIDAD
 from infraestructure.services.log_service import LogManager, Timer
 
 
@@ -22,6 +27,18 @@ class TareaService:
     """
     # Límite máximo de tareas
     MAX_TAREAS = 50000
+    # Archivo con el snapshot completo de las tareas
+    ARCHIVO_TAREAS = "tareas.json"
+    # Registro de operaciones (JSONL) aplicadas desde el último snapshot
+    ARCHIVO_OPERACIONES = "tareas.log"
+    # Número de operaciones registradas tras las cuales se genera un snapshot
+    OPERACIONES_POR_SNAPSHOT = 1000
+    # Adaptadores de pydantic reutilizados (el esquema se compila una sola vez)
+    _ADAPTADOR_TAREA = TypeAdapter(Tarea)
+    _ADAPTADOR_LISTA_TAREAS = TypeAdapter(List[Tarea])
+    _ADAPTADOR_OPERACION = TypeAdapter(OperacionTarea)
+    # Prioridades de menor a mayor
+    _ORDEN_PRIORIDAD = tuple(sorted(PrioridadEnum, key=RANGO_PRIORIDAD.__getitem__))
     
     def __init__(self, log_manager: LogManager):
         """
@@ -33,59 +50,237 @@ class TareaService:
         self.tareas: Dict[int, Tarea] = {}
         self.log_manager = log_manager
         self.siguiente_id = 1
+        self._ops_since_snapshot = 0
+        self._registro_sin_salto_final = False
+        # Índices secundarios: arreglos de IDs por prioridad (en orden de inserción)
+        # y (marca de tiempo de vencimiento, ID) de las tareas no completadas, ordenados
+        self._por_prioridad: Dict[PrioridadEnum, array] = {}
+        self._por_vencimiento: List[Tuple[float, int]] = []
         # Cargar tareas existentes si hay
         self.cargar_tareas()
+        self._reconstruir_indices()
+        # Las mutaciones se añaden al registro de operaciones en lugar de reescribir el snapshot
+        self._archivo_operaciones = open(self.ARCHIVO_OPERACIONES, "ab")
+        if self._registro_sin_salto_final:
+            # Evitar que la próxima operación se concatene a una línea truncada
+            self._archivo_operaciones.write(b"\n")
     
     def cargar_tareas(self):
-        """Carga las tareas desde el archivo de almacenamiento si existe."""
-        archivo_tareas = "tareas.json"
+        """
+        Carga las tareas desde el snapshot si existe y luego reaplica
+        las operaciones registradas después de él.
+        """
+        archivo_tareas = self.ARCHIVO_TAREAS
         if os.path.exists(archivo_tareas):
             try:
-                with open(archivo_tareas, "r", encoding="utf-8") as file:
-                    datos = json.load(file)
-                    
-                    # Procesar el ID máximo
-                    if datos.get("siguiente_id"):
-                        self.siguiente_id = datos["siguiente_id"]
-                    
-                    # Procesar las tareas
-                    if datos.get("tareas"):
-                        for tarea_dict in datos["tareas"]:
-                            # Convertir la fecha de string a datetime
-                            if "fecha_vencimiento" in tarea_dict:
-                                tarea_dict["fecha_vencimiento"] = datetime.fromisoformat(tarea_dict["fecha_vencimiento"])
-                            
-                            try:
-                                tarea = Tarea(**tarea_dict)
-                                self.tareas[tarea.id] = tarea
-                            except ValidationError as e:
-                                self.log_manager.log_error(f"Error al cargar tarea: {e}")
+                with open(archivo_tareas, "rb") as file:
+                    contenido = file.read()
+                
+                try:
+                    # Validar el archivo completo en una sola pasada con pydantic-core
+                    datos = ArchivoTareas.model_validate_json(contenido)
+                    self.siguiente_id = datos.siguiente_id
+                    self.tareas = {tarea.id: tarea for tarea in datos.tareas}
+                except ValidationError:
+                    # Alguna tarea no es válida: cargar una a una descartando las inválidas
+                    self._cargar_tareas_individualmente(contenido)
             except Exception as e:
                 self.log_manager.log_error(f"Error al cargar tareas: {e}")
                 print(f"Error al cargar tareas: {e}")
+        
+        self._reaplicar_operaciones()
     
-    def guardar_tareas(self):
-        """Guarda las tareas en un archivo JSON."""
-        archivo_tareas = "tareas.json"
+    def _cargar_tareas_individualmente(self, contenido: bytes):
+        """
+        Carga las tareas del snapshot validándolas una por una.
+        
+        Args:
+            contenido: Contenido del archivo de tareas
+        """
+        datos = from_json(contenido)
+        
+        # Procesar el ID máximo
+        if datos.get("siguiente_id"):
+            self.siguiente_id = datos["siguiente_id"]
+        
+        # Procesar las tareas
+        for tarea_dict in datos.get("tareas") or []:
+            try:
+                tarea = self._ADAPTADOR_TAREA.validate_python(tarea_dict)
+                self.tareas[tarea.id] = tarea
+            except ValidationError as e:
+                self.log_manager.log_error(f"Error al cargar tarea: {e}")
+    
+    def _reaplicar_operaciones(self):
+        """
+        Reaplica sobre las tareas cargadas las operaciones del registro JSONL.
+        
+        El registro se procesa línea a línea y cada línea se valida directamente
+        desde JSON, sin construir diccionarios intermedios.
+        """
+        if not os.path.exists(self.ARCHIVO_OPERACIONES):
+            return
         try:
-            # Convertir las tareas a formato serializable
-            tareas_serializable = [
-                {**tarea.dict(), "fecha_vencimiento": tarea.fecha_vencimiento.isoformat()}
-                for tarea in self.tareas.values()
-            ]
-            
-            datos = {
-                "siguiente_id": self.siguiente_id,
-                "tareas": tareas_serializable
-            }
+            with open(self.ARCHIVO_OPERACIONES, "rb") as file:
+                for linea in file:
+                    self._registro_sin_salto_final = not linea.endswith(b"\n")
+                    if not linea.strip():
+                        continue
+                    try:
+                        operacion = self._ADAPTADOR_OPERACION.validate_json(linea)
+                        if isinstance(operacion, OperacionAgregar):
+                            tarea = operacion.tarea
+                            self.tareas[tarea.id] = tarea
+                            self.siguiente_id = max(self.siguiente_id, tarea.id + 1)
+                        else:
+                            tarea = self.tareas.get(operacion.id)
+                            if tarea:
+                                tarea.estado = operacion.estado
+                        self._ops_since_snapshot += 1
+                    except ValidationError as e:
+                        self.log_manager.log_error(f"Error al reaplicar operación: {e}")
+        except Exception as e:
+            self.log_manager.log_error(f"Error al leer el registro de operaciones: {e}")
+            print(f"Error al leer el registro de operaciones: {e}")
+    
+    def _reconstruir_indices(self):
+        """
+        Construye los índices secundarios a partir de las tareas cargadas.
+        
+        Las tareas cuya fecha de vencimiento no puede convertirse en clave del
+        índice se registran como error y se descartan.
+        """
+        self._por_prioridad = {prioridad: array("q") for prioridad in self._ORDEN_PRIORIDAD}
+        self._por_vencimiento = []
+        descartadas = []
+        for tarea in self.tareas.values():
+            try:
+                clave = self._clave_vencimiento(tarea)
+            except (ValueError, OverflowError) as e:
+                self.log_manager.log_error(f"Error al cargar tarea {tarea.id}: fecha de vencimiento no válida: {e}")
+                descartadas.append(tarea.id)
+                continue
+            self._por_prioridad[tarea.prioridad].append(tarea.id)
+            if tarea.estado != EstadoEnum.COMPLETADA:
+                self._por_vencimiento.append(clave)
+        for tarea_id in descartadas:
+            del self.tareas[tarea_id]
+        self._por_vencimiento.sort()
+    
+    def _clave_vencimiento(self, tarea: Tarea) -> Tuple[float, int]:
+        """
+        Calcula la clave de una tarea en el índice por vencimiento.
+        
+        Args:
+            tarea: Tarea a indexar
+        
+        Returns:
+            Tupla (marca de tiempo POSIX del vencimiento, ID de la tarea)
+        """
+        # timestamp() admite fechas con y sin zona horaria (las ingenuas se
+        # interpretan en hora local)
+        return (tarea.fecha_vencimiento.timestamp(), tarea.id)
+    
+    def _registrar_operacion(self, operacion: dict):
+        """
+        Añade una operación al registro JSONL y genera un snapshot
+        cuando se acumulan OPERACIONES_POR_SNAPSHOT operaciones.
+        
+        Args:
+            operacion: Diccionario (que puede contener tareas) que describe la operación
+        """
+        try:
+            self._archivo_operaciones.write(to_json(operacion) + b"\n")
+            self._archivo_operaciones.flush()
+        except Exception as e:
+            self.log_manager.log_error(f"Error al registrar operación: {e}")
+            print(f"Error al registrar operación: {e}")
+            return
+        
+        self._ops_since_snapshot += 1
+        if self._ops_since_snapshot >= self.OPERACIONES_POR_SNAPSHOT:
+            self._snapshot()
+    
+    def _snapshot(self):
+        """Guarda el snapshot completo y vacía el registro de operaciones."""
+        if not self.guardar_tareas():
+            # El registro conserva las operaciones; reintentar tras otras
+            # OPERACIONES_POR_SNAPSHOT operaciones en lugar de en cada mutación
+            self._ops_since_snapshot = 0
+            return
+        self._archivo_operaciones.close()
+        self._archivo_operaciones = open(self.ARCHIVO_OPERACIONES, "wb")
+        self._ops_since_snapshot = 0
+    
+    def cerrar(self):
+        """Genera un snapshot final y cierra el registro de operaciones."""
+        if self._archivo_operaciones.closed:
+            return
+        if self._ops_since_snapshot:
+            self._snapshot()
+        self._archivo_operaciones.close()
+    
+    def guardar_tareas(self) -> bool:
+        """
+        Guarda el snapshot completo de las tareas en un archivo JSON.
+        
+        El contenido se escribe en un archivo temporal del mismo directorio que
+        luego reemplaza al snapshot, de modo que una interrupción durante la
+        escritura nunca deja un snapshot incompleto.
+        
+        Returns:
+            True si el snapshot se escribió correctamente, False en caso contrario
+        """
+        archivo_tareas = self.ARCHIVO_TAREAS
+        try:
+            # Serializar las tareas directamente a JSON con pydantic-core
+            tareas_json = self._ADAPTADOR_LISTA_TAREAS.dump_json(list(self.tareas.values()))
+            datos = b'{"siguiente_id":%d,"tareas":%s}' % (self.siguiente_id, tareas_json)
             
-            with open(archivo_tareas, "w", encoding="utf-8") as file:
-                json.dump(datos, file, indent=2, ensure_ascii=False)
+            archivo_temporal = archivo_tareas + ".tmp"
+            with open(archivo_temporal, "wb") as file:
+                file.write(datos)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(archivo_temporal, archivo_tareas)
+            return True
         except Exception as e:
             self.log_manager.log_error(f"Error al guardar tareas: {e}")
             print(f"Error al guardar tareas: {e}")
+            return False
     
-    def agregar_tarea(self, titulo: str, descripcion: str, prioridad: str, 
+    @classmethod
+    @lru_cache(maxsize=128)
+    def _validar_datos_tarea(cls, titulo: str, descripcion: str, prioridad: PrioridadEnum,
+                             fecha_vencimiento_iso: str) -> Tarea:
+        """
+        Valida los datos de una nueva tarea y devuelve una tarea plantilla (ID 0).
+        
+        Los resultados válidos se cachean por combinación de datos, de modo que
+        un envío repetido no vuelve a pasar por la validación de pydantic.
+        Los datos inválidos lanzan ValidationError y no se cachean. La fecha se
+        recibe en formato ISO para que fechas del mismo instante con distinta
+        zona horaria no compartan entrada en la caché.
+        
+        Args:
+            titulo: Título de la tarea
+            descripcion: Descripción detallada
+            prioridad: Nivel de prioridad
+            fecha_vencimiento_iso: Fecha límite en formato ISO 8601 (isoformat())
+        
+        Returns:
+            Tarea validada con ID 0, que no debe modificarse
+        """
+        return cls._ADAPTADOR_TAREA.validate_python({
+            "id": 0,
+            "titulo": titulo,
+            "descripcion": descripcion,
+            "prioridad": prioridad,
+            "estado": EstadoEnum.PENDIENTE,
+            "fecha_vencimiento": datetime.fromisoformat(fecha_vencimiento_iso)
+        })
+    
+    def agregar_tarea(self, titulo: str, descripcion: str, prioridad: PrioridadEnum, 
                      fecha_vencimiento: datetime) -> Optional[Tarea]:
         """
         Agrega una nueva tarea al sistema.
@@ -93,7 +288,7 @@ class TareaService:
         Args:
             titulo: Título de la tarea
             descripcion: Descripción detallada
-            prioridad: Nivel de prioridad (alta, media, baja)
+            prioridad: Nivel de prioridad
             fecha_vencimiento: Fecha límite para completar la tarea
         
         Returns:
@@ -109,26 +304,44 @@ class TareaService:
                 self.log_manager.log_error(mensaje)
                 raise ValueError(mensaje)
             
+            # Verificar que la fecha de vencimiento no esté en el pasado, comparando
+            # en la misma zona horaria (o sin zona) que la fecha recibida
             try:
-                # Crear la nueva tarea
-                nueva_tarea = Tarea(
-                    id=self.siguiente_id,
-                    titulo=titulo,
-                    descripcion=descripcion,
-                    prioridad=PrioridadEnum(prioridad.lower()),
-                    estado=EstadoEnum.PENDIENTE,
-                    fecha_vencimiento=fecha_vencimiento
+                en_el_pasado = fecha_vencimiento < datetime.now(fecha_vencimiento.tzinfo)
+            except (AttributeError, TypeError) as e:
+                mensaje = f"Fecha de vencimiento no válida: {e}"
+                self.log_manager.log_error(mensaje)
+                raise ValueError(mensaje)
+            if en_el_pasado:
+                mensaje = "La fecha de vencimiento no puede ser en el pasado"
+                self.log_manager.log_error(mensaje)
+                raise ValueError(mensaje)
+            
+            try:
+                # Crear la nueva tarea a partir de la plantilla validada
+                plantilla = self._validar_datos_tarea(
+                    titulo, descripcion, prioridad, fecha_vencimiento.isoformat()
+                )
+                nueva_tarea = plantilla.model_copy(
+                    update={"id": self.siguiente_id, "fecha_vencimiento": fecha_vencimiento}
                 )
+                clave_vencimiento = self._clave_vencimiento(nueva_tarea)
                 
-                # Añadir la tarea a la colección
+                # Añadir la tarea a la colección y a los índices (solo cuando
+                # ya no queda nada que pueda fallar)
                 self.tareas[self.siguiente_id] = nueva_tarea
+                self._por_prioridad[nueva_tarea.prioridad].append(nueva_tarea.id)
+                insort(self._por_vencimiento, clave_vencimiento)
                 self.log_manager.log_data_operation("Tarea agregada", f"ID: {self.siguiente_id}, Título: {titulo}")
                 
                 # Incrementar el ID para la próxima tarea
                 self.siguiente_id += 1
                 
-                # Guardar los cambios
-                self.guardar_tareas()
+                # Registrar la operación en el log de tareas
+                self._registrar_operacion({
+                    "op": "add",
+                    "tarea": nueva_tarea
+                })
                 
                 return nueva_tarea
                 
@@ -167,25 +380,11 @@ class TareaService:
             Lista de tareas ordenadas por prioridad
         """
         with Timer("Listar tareas por prioridad", self.log_manager):
-            # Mapeo de prioridades a valores numéricos para ordenamiento
-            prioridad_valor = {
-                PrioridadEnum.BAJA: 1,
-                PrioridadEnum.MEDIA: 2,
-                PrioridadEnum.ALTA: 3
-            }
-            
-            # Obtener todas las tareas como una lista
-            tareas_lista = list(self.tareas.values())
-            
-            # Ordenar según el criterio
-            if ascendente:
-                # Ordenar de menor a mayor prioridad (baja -> alta)
-                tareas_ordenadas = sorted(tareas_lista, key=lambda t: prioridad_valor[t.prioridad])
-            else:
-                # Ordenar de mayor a menor prioridad (alta -> baja)
-                tareas_ordenadas = sorted(tareas_lista, key=lambda t: prioridad_valor[t.prioridad], reverse=True)
-            
-            return tareas_ordenadas
+            # Concatenar los índices por prioridad en el orden solicitado
+            orden = self._ORDEN_PRIORIDAD if ascendente else reversed(self._ORDEN_PRIORIDAD)
+            return [self.tareas[tarea_id]
+                    for prioridad in orden
+                    for tarea_id in self._por_prioridad[prioridad]]
     
     def listar_tareas_por_vencimiento(self) -> List[Tarea]:
         """
@@ -196,13 +395,10 @@ class TareaService:
             Lista de tareas ordenadas por fecha de vencimiento
         """
         with Timer("Listar tareas por vencimiento", self.log_manager):
-            # Filtrar solo tareas no completadas y ordenar por fecha de vencimiento
-            tareas_pendientes = [tarea for tarea in self.tareas.values() 
-                                if tarea.estado != EstadoEnum.COMPLETADA]
-            
-            return sorted(tareas_pendientes, key=lambda t: t.fecha_vencimiento)
+            # El índice ya contiene solo tareas no completadas ordenadas por fecha
+            return [self.tareas[tarea_id] for _, tarea_id in self._por_vencimiento]
     
-    def actualizar_estado_tarea(self, tarea_id: int, nuevo_estado: str) -> Optional[Tarea]:
+    def actualizar_estado_tarea(self, tarea_id: int, nuevo_estado: EstadoEnum) -> Optional[Tarea]:
         """
         Actualiza el estado de una tarea.
         
@@ -212,9 +408,6 @@ class TareaService:
         
         Returns:
             La tarea actualizada o None si no se encontró
-            
-        Raises:
-            ValueError: Si el estado proporcionado no es válido
         """
         with Timer("Actualizar estado de tarea", self.log_manager):
             # Verificar que la tarea existe
@@ -222,23 +415,28 @@ class TareaService:
             if not tarea:
                 return None
             
-            try:
-                # Validar y actualizar el estado
-                estado_enum = EstadoEnum(nuevo_estado.lower())
-                tarea.estado = estado_enum
-                
-                # Registrar la operación
-                self.log_manager.log_data_operation(
-                    "Estado de tarea actualizado", 
-                    f"ID: {tarea_id}, Nuevo estado: {nuevo_estado}"
-                )
-                
-                # Guardar los cambios
-                self.guardar_tareas()
-                
+            # Si el estado no cambia no hay nada que registrar
+            if tarea.estado == nuevo_estado:
                 return tarea
-                
-            except ValueError:
-                mensaje_error = f"Estado no válido: {nuevo_estado}"
-                self.log_manager.log_error(mensaje_error)
-                raise ValueError(mensaje_error)
\ No newline at end of file
+            
+            # Actualizar el estado
+            estado_anterior = tarea.estado
+            tarea.estado = nuevo_estado
+            
+            # Mover la tarea dentro o fuera del índice por vencimiento
+            clave = self._clave_vencimiento(tarea)
+            if nuevo_estado == EstadoEnum.COMPLETADA and estado_anterior != EstadoEnum.COMPLETADA:
+                del self._por_vencimiento[bisect_left(self._por_vencimiento, clave)]
+            elif nuevo_estado != EstadoEnum.COMPLETADA and estado_anterior == EstadoEnum.COMPLETADA:
+                insort(self._por_vencimiento, clave)
+            
+            # Registrar la operación
+            self.log_manager.log_data_operation(
+                "Estado de tarea actualizado", 
+                f"ID: {tarea_id}, Nuevo estado: {nuevo_estado.value}"
+            )
+            
+            # Registrar la operación en el log de tareas
+            self._registrar_operacion({"op": "update", "id": tarea_id, "estado": nuevo_estado})
+            
+            return tarea
\ No newline at end of file
@@ -5,13 +5,23 @@ Maneja la interfaz de usuario y la interacción con los servicios.
 import os
 import sys
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from entities.models.tarea import Tarea
 from entities.enums.enums import PrioridadEnum, EstadoEnum
 from infraestructure.services.tarea_service import TareaService
 from infraestructure.services.log_service import LogManager, Timer
 
+# Rangos de opciones válidas de cada menú
+OPCIONES_MENU = range(6)
+OPCIONES_PRIORIDAD = range(1, 4)
+OPCIONES_ORDEN = range(1, 3)
+OPCIONES_ESTADO = range(1, 4)
+
+# Valores asociados a cada opción (en el orden en que se muestran)
+PRIORIDADES = (PrioridadEnum.ALTA, PrioridadEnum.MEDIA, PrioridadEnum.BAJA)
+ESTADOS = (EstadoEnum.PENDIENTE, EstadoEnum.EN_PROGRESO, EstadoEnum.COMPLETADA)
+
 
 class SistemaTareas:
     """
@@ -48,7 +58,7 @@ class SistemaTareas:
         print("0. Salir")
         print()
         
-        return self.obtener_opcion("Seleccione una opción: ", rango_valido=range(6))
+        return self.obtener_opcion("Seleccione una opción: ", rango_valido=OPCIONES_MENU)
     
     def obtener_opcion(self, mensaje: str, rango_valido=None) -> int:
         """
@@ -56,7 +66,7 @@ class SistemaTareas:
         
         Args:
             mensaje: Texto a mostrar al usuario
-            rango_valido: Rango de valores aceptables
+            rango_valido: Rango (range) de valores aceptables
         
         Returns:
             Opción numérica seleccionada
@@ -67,7 +77,7 @@ class SistemaTareas:
                 valor = int(opcion)
                 
                 if rango_valido is not None and valor not in rango_valido:
-                    print(f"Error: Debe ingresar un número entre {min(rango_valido)} y {max(rango_valido)}")
+                    print(f"Error: Debe ingresar un número entre {rango_valido[0]} y {rango_valido[-1]}")
                     continue
                     
                 return valor
@@ -100,6 +110,27 @@ class SistemaTareas:
                 self.log_manager.log_error(f"Formato de fecha inválido: {fecha_str}")
                 print("Error: Formato de fecha inválido. Use YYYY-MM-DD HH:MM")
     
+    def formatear_tarea(self, tarea: Tarea) -> str:
+        """
+        Genera el bloque de texto con los detalles de una tarea.
+        
+        Args:
+            tarea: Tarea a formatear
+        
+        Returns:
+            Texto de varias líneas listo para escribir en consola
+        """
+        return (
+            f"\n{'-' * 50}\n"
+            f"ID: {tarea.id}\n"
+            f"Título: {tarea.titulo}\n"
+            f"Descripción: {tarea.descripcion}\n"
+            f"Prioridad: {tarea.prioridad.value}\n"
+            f"Estado: {tarea.estado.value}\n"
+            f"Fecha de vencimiento: {tarea.fecha_vencimiento.strftime('%Y-%m-%d %H:%M')}\n"
+            f"{'-' * 50}\n\n"
+        )
+    
     def mostrar_tarea(self, tarea: Tarea):
         """
         Muestra los detalles de una tarea.
@@ -107,14 +138,17 @@ class SistemaTareas:
         Args:
             tarea: Tarea a mostrar
         """
-        print("\n" + "-" * 50)
-        print(f"ID: {tarea.id}")
-        print(f"Título: {tarea.titulo}")
-        print(f"Descripción: {tarea.descripcion}")
-        print(f"Prioridad: {tarea.prioridad.value}")
-        print(f"Estado: {tarea.estado.value}")
-        print(f"Fecha de vencimiento: {tarea.fecha_vencimiento.strftime('%Y-%m-%d %H:%M')}")
-        print("-" * 50 + "\n")
+        sys.stdout.write(self.formatear_tarea(tarea))
+    
+    def mostrar_tareas(self, tareas: List[Tarea]):
+        """
+        Muestra los detalles de varias tareas con una sola escritura en consola.
+        
+        Args:
+            tareas: Lista de tareas a mostrar
+        """
+        sys.stdout.write("".join(map(self.formatear_tarea, tareas)))
+        sys.stdout.flush()
     
     def agregar_tarea(self):
         """Gestiona el proceso de agregar una nueva tarea."""
@@ -130,11 +164,10 @@ class SistemaTareas:
             print("1. Alta")
             print("2. Media")
             print("3. Baja")
-            opcion_prioridad = self.obtener_opcion("Seleccione la prioridad: ", range(1, 4))
+            opcion_prioridad = self.obtener_opcion("Seleccione la prioridad: ", OPCIONES_PRIORIDAD)
             
             # Mapear opción a valor de prioridad
-            prioridades = ["alta", "media", "baja"]
-            prioridad = prioridades[opcion_prioridad - 1]
+            prioridad = PRIORIDADES[opcion_prioridad - 1]
             
             # Obtener fecha de vencimiento
             fecha_vencimiento = self.obtener_fecha("Fecha de vencimiento")
@@ -183,7 +216,7 @@ class SistemaTareas:
         print("Orden de prioridad:")
         print("1. Ascendente (Baja → Media → Alta)")
         print("2. Descendente (Alta → Media → Baja)")
-        opcion = self.obtener_opcion("Seleccione el orden: ", range(1, 3))
+        opcion = self.obtener_opcion("Seleccione el orden: ", OPCIONES_ORDEN)
         
         ascendente = opcion == 1
         
@@ -194,8 +227,7 @@ class SistemaTareas:
                 print("\nNo hay tareas registradas en el sistema")
             else:
                 print(f"\nSe encontraron {len(tareas)} tareas:")
-                for tarea in tareas:
-                    self.mostrar_tarea(tarea)
+                self.mostrar_tareas(tareas)
         
         input("\nPresione Enter para continuar...")
     
@@ -211,8 +243,7 @@ class SistemaTareas:
                 print("\nNo hay tareas pendientes o en progreso")
             else:
                 print(f"\nSe encontraron {len(tareas)} tareas pendientes o en progreso:")
-                for tarea in tareas:
-                    self.mostrar_tarea(tarea)
+                self.mostrar_tareas(tareas)
         
         input("\nPresione Enter para continuar...")
     
@@ -240,11 +271,10 @@ class SistemaTareas:
             print("1. Pendiente")
             print("2. En progreso")
             print("3. Completada")
-            opcion_estado = self.obtener_opcion("Seleccione el estado: ", range(1, 4))
+            opcion_estado = self.obtener_opcion("Seleccione el estado: ", OPCIONES_ESTADO)
             
             # Mapear opción a valor de estado
-            estados = ["pendiente", "en progreso", "completada"]
-            nuevo_estado = estados[opcion_estado - 1]
+            nuevo_estado = ESTADOS[opcion_estado - 1]
             
             # Actualizar el estado
             with Timer("Actualizar estado (interfaz)", self.log_manager):
@@ -290,6 +320,8 @@ class SistemaTareas:
             print(f"\nError inesperado: {str(e)}")
             self.log_manager.log_error(f"Error inesperado: {str(e)}")
         finally:
+            self.tarea_service.cerrar()
+            self.log_manager.close()
             print("\n¡Hasta pronto!")
 
 